@@ -1,12 +1,18 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-import sqlite3
-import json
+from typing import List, Optional, Dict, Any, AsyncIterator, Union
+import aiosqlite
+import asyncio
+import hashlib
+import orjson
 import os
-from datetime import datetime, date
+import re
+from contextlib import asynccontextmanager
+from operator import attrgetter
+from cachetools import TTLCache
+from cachetools.func import ttl_cache
 import logging
 
 # Edgar imports
@@ -20,29 +26,67 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="EDGAR Explorer", description="Explore SEC EDGAR filings data")
-
 # Database setup
 DB_PATH = "edgar_cache.db"
 
-def init_db():
+# Applied to every connection: WAL lets readers run alongside the cache writers,
+# NORMAL sync drops the per-commit double fsync, and the rest keep hot pages in memory
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+async def _connect() -> aiosqlite.Connection:
+    """Open a SQLite connection in autocommit mode with the cache PRAGMAs applied"""
+    conn = await aiosqlite.connect(DB_PATH, isolation_level=None)
+    for pragma in SQLITE_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+async def _rebuild_without_rowid(conn: aiosqlite.Connection, table: str, key: str, create_sql: str):
+    """Migrate a cache table created as a rowid table to its WITHOUT ROWID layout"""
+    async with conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ) as cursor:
+        row = await cursor.fetchone()
+    if not row or "WITHOUT ROWID" in row[0].upper():
+        return
+    
+    logger.info(f"Migrating {table} table to WITHOUT ROWID")
+    await conn.execute("BEGIN")
+    try:
+        await conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+        await conn.execute(create_sql)
+        # WITHOUT ROWID primary keys are NOT NULL, so rows cached under a NULL key are dropped
+        await conn.execute(f"INSERT OR IGNORE INTO {table} SELECT * FROM {table}_old WHERE {key} IS NOT NULL")
+        await conn.execute(f"DROP TABLE {table}_old")
+    except Exception:
+        await conn.execute("ROLLBACK")
+        raise
+    await conn.execute("COMMIT")
+
+async def init_db():
     """Initialize SQLite database for caching"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = await _connect()
     
     # Companies table
-    cursor.execute("""
+    companies_sql = """
         CREATE TABLE IF NOT EXISTS companies (
             ticker TEXT PRIMARY KEY,
             cik TEXT,
             name TEXT,
             data TEXT,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+        ) WITHOUT ROWID
+    """
+    await conn.execute(companies_sql)
+    await _rebuild_without_rowid(conn, "companies", "ticker", companies_sql)
     
     # Filings table
-    cursor.execute("""
+    filings_sql = """
         CREATE TABLE IF NOT EXISTS filings (
             accession_no TEXT PRIMARY KEY,
             ticker TEXT,
@@ -50,11 +94,13 @@ def init_db():
             filing_date TEXT,
             data TEXT,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+        ) WITHOUT ROWID
+    """
+    await conn.execute(filings_sql)
+    await _rebuild_without_rowid(conn, "filings", "accession_no", filings_sql)
     
     # Financial data table
-    cursor.execute("""
+    await conn.execute("""
         CREATE TABLE IF NOT EXISTS financials (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             ticker TEXT,
@@ -64,11 +110,61 @@ def init_db():
         )
     """)
     
-    conn.commit()
-    conn.close()
+    # Indexes matching the cache lookups so WHERE + ORDER BY become an index walk
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_filings_ticker_form_date ON filings(ticker, form, filing_date DESC)")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_filings_ticker_date ON filings(ticker, filing_date DESC)")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_cik ON companies(cik)")
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_financials_ticker_type ON financials(ticker, statement_type)")
+    
+    await conn.close()
+
+# Connection pool - handlers borrow a warm connection instead of opening one per call.
+# aiosqlite runs each connection on its own thread, so queries don't block the event loop.
+POOL_SIZE = 8
+_pool: Optional["asyncio.Queue[aiosqlite.Connection]"] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database and open the connection pool for the app's lifetime"""
+    global _pool
+    await init_db()
+    _pool = asyncio.Queue()
+    for _ in range(POOL_SIZE):
+        _pool.put_nowait(await _connect())
+    try:
+        yield
+    finally:
+        while not _pool.empty():
+            await _pool.get_nowait().close()
+        _pool = None
+
+@asynccontextmanager
+async def get_conn():
+    """Borrow a connection from the pool and return it when done"""
+    conn = await _pool.get()
+    try:
+        yield conn
+    finally:
+        _pool.put_nowait(conn)
+
+@asynccontextmanager
+async def get_transaction():
+    """Borrow a pooled connection and wrap the block in a single transaction"""
+    async with get_conn() as conn:
+        await conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            await conn.execute("ROLLBACK")
+            raise
+        await conn.execute("COMMIT")
 
-# Initialize database on startup
-init_db()
+app = FastAPI(
+    title="EDGAR Explorer",
+    description="Explore SEC EDGAR filings data",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # Set EDGAR identity
 edgar_identity = os.getenv("EDGAR_IDENTITY", "edgar-explorer@example.com")
@@ -99,131 +195,227 @@ class SearchRequest(BaseModel):
     date_to: Optional[str] = None
 
 # Database helper functions
-def get_cached_company(ticker: str) -> Optional[Dict]:
-    """Get cached company data"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT data FROM companies WHERE ticker = ?", (ticker,))
-    result = cursor.fetchone()
-    conn.close()
-    return json.loads(result[0]) if result else None
-
-def cache_company(ticker: str, data: Dict):
-    """Cache company data"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO companies (ticker, cik, name, data)
-        VALUES (?, ?, ?, ?)
-    """, (ticker, data.get('cik'), data.get('name'), json.dumps(data)))
-    conn.commit()
-    conn.close()
-
-def get_cached_filings(ticker: str, form: Optional[str] = None) -> List[Dict]:
-    """Get cached filings for a company"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    if form:
-        cursor.execute("""
-            SELECT data FROM filings 
-            WHERE ticker = ? AND form = ?
-            ORDER BY filing_date DESC
-        """, (ticker, form))
-    else:
-        cursor.execute("""
-            SELECT data FROM filings 
-            WHERE ticker = ?
-            ORDER BY filing_date DESC
-        """, (ticker,))
-    
-    results = cursor.fetchall()
-    conn.close()
-    return [json.loads(row[0]) for row in results]
-
-def cache_filing(filing_data: Dict):
-    """Cache filing data"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO filings (accession_no, ticker, form, filing_date, data)
-        VALUES (?, ?, ?, ?, ?)
-    """, (
+# Statements are kept as constants so each pooled connection's statement cache
+# (keyed on the SQL text) reuses the compiled statement instead of re-preparing it
+_SQL_GET_COMPANY = "SELECT data FROM companies WHERE ticker = ?"
+_SQL_PUT_COMPANY = """
+    INSERT OR REPLACE INTO companies (ticker, cik, name, data)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_GET_FILINGS = """
+    SELECT data FROM filings
+    WHERE ticker = ?
+    ORDER BY filing_date DESC
+"""
+_SQL_GET_FILINGS_BY_FORM = """
+    SELECT data FROM filings
+    WHERE ticker = ? AND form = ?
+    ORDER BY filing_date DESC
+"""
+_SQL_PUT_FILING = """
+    INSERT OR REPLACE INTO filings (accession_no, ticker, form, filing_date, data)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+def _to_json(data: Any) -> str:
+    """Serialize cache data for the TEXT data column (orjson returns UTF-8 bytes)"""
+    return orjson.dumps(data).decode()
+
+def _company_row(ticker: str, data: Dict) -> tuple:
+    """Build the parameters for _SQL_PUT_COMPANY"""
+    return (ticker, data.get('cik'), data.get('name'), _to_json(data))
+
+def _filing_row(filing_data: Dict) -> tuple:
+    """Build the parameters for _SQL_PUT_FILING"""
+    return (
         filing_data['accession_no'],
         filing_data.get('ticker'),
         filing_data['form'],
         filing_data['filing_date'],
-        json.dumps(filing_data)
-    ))
-    conn.commit()
-    conn.close()
+        _to_json(filing_data)
+    )
+
+# Hot company lookups are answered from memory; the cache_company* writers evict
+# the ticker so a fresh row is never shadowed by a stale in-process copy.
+# Writers also bump _company_writes, and a reader only refills the cache if no
+# write finished while its SELECT was in flight (it may have read the old row).
+COMPANY_CACHE_TTL = 300
+_company_cache: TTLCache = TTLCache(maxsize=4096, ttl=COMPANY_CACHE_TTL)
+_company_writes = 0
+
+def _evict_companies(tickers: List[str]):
+    """Drop rewritten tickers from the in-process cache and invalidate in-flight refills"""
+    global _company_writes
+    _company_writes += 1
+    for ticker in tickers:
+        _company_cache.pop(ticker, None)
+
+async def get_cached_company_json(ticker: str) -> Optional[str]:
+    """Get cached company data as the stored JSON text"""
+    cached = _company_cache.get(ticker)
+    if cached is not None:
+        return cached
+    writes = _company_writes
+    async with get_conn() as conn:
+        async with conn.execute(_SQL_GET_COMPANY, (ticker,)) as cursor:
+            result = await cursor.fetchone()
+    if not result:
+        return None
+    if writes == _company_writes:
+        _company_cache[ticker] = result[0]
+    return result[0]
+
+async def cache_company(ticker: str, data: Dict):
+    """Cache company data"""
+    async with get_conn() as conn:
+        await conn.execute(_SQL_PUT_COMPANY, _company_row(ticker, data))
+    _evict_companies([ticker])
+
+async def cache_companies_bulk(companies: List[Dict]):
+    """Cache a batch of company records in one transaction"""
+    # Rows without a ticker can't be looked up again (and ticker is the NOT NULL key)
+    companies = [data for data in companies if data.get('ticker')]
+    if not companies:
+        return
+    async with get_transaction() as conn:
+        await conn.executemany(_SQL_PUT_COMPANY, [_company_row(data['ticker'], data) for data in companies])
+    _evict_companies([data['ticker'] for data in companies])
+
+async def get_cached_filings_json(ticker: str, form: Optional[str] = None) -> List[str]:
+    """Get cached filings for a company as the stored JSON text of each row"""
+    async with get_conn() as conn:
+        if form:
+            results = await conn.execute_fetchall(_SQL_GET_FILINGS_BY_FORM, (ticker, form))
+        else:
+            results = await conn.execute_fetchall(_SQL_GET_FILINGS, (ticker,))
+    return [row[0] for row in results]
+
+async def cache_filings_bulk(filings: List[Dict]):
+    """Cache a batch of filings in one transaction"""
+    if not filings:
+        return
+    async with get_transaction() as conn:
+        await conn.executemany(_SQL_PUT_FILING, [_filing_row(filing_data) for filing_data in filings])
+
+# Company always defines sic and industry, so both are read in one C-level call.
+# Other optional fields are missing on some edgartools types and use getattr defaults.
+_company_extras = attrgetter('sic', 'industry')
+
+# HTTP caching - cache-hit responses carry an ETag so repeat requests get a bodiless 304
+CACHE_CONTROL = "public, max-age=60"
+
+def _etag(body: bytes) -> str:
+    """Build a strong ETag from a response body"""
+    return f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match already covers this ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+def _cached_json_response(request: Request, body: Union[str, bytes]) -> Response:
+    """Send cached JSON with ETag/Cache-Control headers, or 304 if the client has it"""
+    if isinstance(body, str):
+        body = body.encode()
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Main page - kept in memory and only re-read when the file changes on disk,
+# so edits to index.html still show up during development
+INDEX_HTML_PATH = "index.html"
+_index_html: Optional[tuple] = None  # (mtime_ns, content)
+
+def _get_index_html() -> bytes:
+    """Get the main HTML page, re-reading it only if its mtime has changed"""
+    global _index_html
+    mtime = os.stat(INDEX_HTML_PATH).st_mtime_ns
+    if _index_html is None or _index_html[0] != mtime:
+        with open(INDEX_HTML_PATH, "rb") as f:
+            _index_html = (mtime, f.read())
+    return _index_html[1]
 
 # API Routes
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
     """Serve the main HTML page"""
-    with open("index.html", "r") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(content=_get_index_html())
+
+# Queries shaped like a ticker (optionally with a share-class suffix) or a CIK are
+# worth a direct Company lookup; anything else goes straight to the name search
+_TICKER_RE = re.compile(r'^(?:[A-Z]{1,5}(?:[.-][A-Z]{1,2})?|\d{1,10})$')
 
 @app.get("/api/search/companies")
 async def search_companies(q: str = Query(..., description="Company name or ticker to search")):
     """Search for companies by name or ticker"""
     try:
         # Try to find company directly first
-        try:
-            company = Company(q.upper())
-            company_data = {
-                "ticker": q.upper(),
-                "cik": company.cik,
-                "name": company.name,
-                "sic": getattr(company, 'sic', None),
-                "industry": getattr(company, 'industry', None)
-            }
-            cache_company(q.upper(), company_data)
-            return [company_data]
-        except:
-            # If direct lookup fails, try search
-            results = find_company(q)
-            if hasattr(results, 'companies'):
-                companies = []
-                for comp in results.companies[:10]:  # Limit to 10 results
-                    company_data = {
-                        "ticker": comp.ticker,
-                        "cik": comp.cik,
-                        "name": comp.name,
-                        "sic": getattr(comp, 'sic', None),
-                        "industry": getattr(comp, 'industry', None)
-                    }
-                    companies.append(company_data)
-                    cache_company(comp.ticker, company_data)
-                return companies
-            else:
-                return []
+        q_upper = q.upper()
+        if _TICKER_RE.match(q_upper):
+            try:
+                company = Company(q_upper)
+                sic, industry = _company_extras(company)
+                company_data = {
+                    "ticker": q_upper,
+                    "cik": company.cik,
+                    "name": company.name,
+                    "sic": sic,
+                    "industry": industry
+                }
+                await cache_company(q_upper, company_data)
+                return [company_data]
+            except Exception as e:
+                logger.info(f"Direct lookup for {q_upper} failed, falling back to search: {e}")
+        
+        # If direct lookup fails or doesn't apply, try search
+        results = find_company(q)
+        if hasattr(results, 'companies'):
+            companies = []
+            for comp in results.companies[:10]:  # Limit to 10 results
+                company_data = {
+                    "ticker": comp.ticker,
+                    "cik": comp.cik,
+                    "name": comp.name,
+                    "sic": getattr(comp, 'sic', None),
+                    "industry": getattr(comp, 'industry', None)
+                }
+                companies.append(company_data)
+            await cache_companies_bulk(companies)
+            return companies
+        else:
+            return []
     except Exception as e:
         logger.error(f"Error searching companies: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/company/{ticker}")
-async def get_company_info(ticker: str):
+async def get_company_info(ticker: str, request: Request):
     """Get detailed company information"""
     try:
         # Check cache first
-        cached = get_cached_company(ticker.upper())
+        # Cached rows are already JSON, so send them without a decode/encode round-trip
+        cached = await get_cached_company_json(ticker.upper())
         if cached:
-            return cached
+            return _cached_json_response(request, cached)
         
         # Fetch from EDGAR
         company = Company(ticker.upper())
+        sic, industry = _company_extras(company)
         company_data = {
             "ticker": ticker.upper(),
             "cik": company.cik,
             "name": company.name,
-            "sic": getattr(company, 'sic', None),
-            "industry": getattr(company, 'industry', None),
+            "sic": sic,
+            "industry": industry,
             "description": getattr(company, 'description', None)
         }
         
-        cache_company(ticker.upper(), company_data)
+        await cache_company(ticker.upper(), company_data)
         return company_data
         
     except Exception as e:
@@ -233,15 +425,16 @@ async def get_company_info(ticker: str):
 @app.get("/api/company/{ticker}/filings")
 async def get_company_filings(
     ticker: str,
+    request: Request,
     form: Optional[str] = None,
     limit: int = Query(20, description="Number of filings to return")
 ):
     """Get filings for a company"""
     try:
         # Check cache first
-        cached_filings = get_cached_filings(ticker.upper(), form)
+        cached_filings = await get_cached_filings_json(ticker.upper(), form)
         if cached_filings and len(cached_filings) >= limit:
-            return cached_filings[:limit]
+            return _cached_json_response(request, "[" + ",".join(cached_filings[:limit]) + "]")
         
         # Fetch from EDGAR
         company = Company(ticker.upper())
@@ -262,14 +455,36 @@ async def get_company_filings(
                 "size": getattr(filing, 'size', 0)
             }
             filings_data.append(filing_data)
-            cache_filing(filing_data)
         
+        await cache_filings_bulk(filings_data)
         return filings_data
         
     except Exception as e:
         logger.error(f"Error getting filings: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _json_default(value: Any) -> str:
+    """Serialize values orjson doesn't handle natively, such as pandas Timestamps"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+def _statement_json(fetch_statement, label: str) -> Optional[str]:
+    """Fetch one financial statement as a JSON array of records; None if empty, "[]" if it failed"""
+    try:
+        statement = fetch_statement()
+        if statement is not None and not statement.empty:
+            # Columns are converted in bulk with tolist() and encoded by orjson, which skips
+            # to_dict('records')'s per-cell coercion but keeps floats exact (to_json rounds them)
+            columns = [column if isinstance(column, str) else _json_default(column) for column in statement.columns]
+            values = [statement[column].tolist() for column in statement.columns]
+            records = [dict(zip(columns, row)) for row in zip(*values)]
+            return orjson.dumps(records, default=_json_default).decode()
+        return None
+    except Exception as e:
+        logger.warning(f"Could not get {label}: {e}")
+        return "[]"
+
 @app.get("/api/company/{ticker}/financials")
 async def get_company_financials(ticker: str):
     """Get financial statements for a company"""
@@ -277,46 +492,44 @@ async def get_company_financials(ticker: str):
         company = Company(ticker.upper())
         financials = company.get_financials()
         
-        result = {}
-        
-        # Get balance sheet
-        try:
-            balance_sheet = financials.balance_sheet()
-            if balance_sheet is not None and not balance_sheet.empty:
-                result["balance_sheet"] = balance_sheet.to_dict('records')
-        except Exception as e:
-            logger.warning(f"Could not get balance sheet: {e}")
-            result["balance_sheet"] = []
-        
-        # Get income statement
-        try:
-            income_statement = financials.income_statement()
-            if income_statement is not None and not income_statement.empty:
-                result["income_statement"] = income_statement.to_dict('records')
-        except Exception as e:
-            logger.warning(f"Could not get income statement: {e}")
-            result["income_statement"] = []
-        
-        # Get cash flow statement
-        try:
-            cash_flow = financials.cashflow_statement()
-            if cash_flow is not None and not cash_flow.empty:
-                result["cash_flow"] = cash_flow.to_dict('records')
-        except Exception as e:
-            logger.warning(f"Could not get cash flow: {e}")
-            result["cash_flow"] = []
+        # The three statements are independent EDGAR fetches, so run them concurrently
+        loop = asyncio.get_running_loop()
+        balance_sheet, income_statement, cash_flow = await asyncio.gather(
+            loop.run_in_executor(None, _statement_json, financials.balance_sheet, "balance sheet"),
+            loop.run_in_executor(None, _statement_json, financials.income_statement, "income statement"),
+            loop.run_in_executor(None, _statement_json, financials.cashflow_statement, "cash flow")
+        )
         
-        return result
+        # Each statement is already JSON, so assemble the envelope around it directly
+        statements = (
+            ("balance_sheet", balance_sheet),
+            ("income_statement", income_statement),
+            ("cash_flow", cash_flow)
+        )
+        body = ",".join(f'"{key}":{records}' for key, records in statements if records is not None)
+        return Response(content="{" + body + "}", media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error getting financials: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Accession numbers are immutable, so a fetched filing can be reused across endpoints
+FILING_CACHE_TTL = 3600
+
+@ttl_cache(maxsize=1024, ttl=FILING_CACHE_TTL)
+def _fetch_filing(accession_no: str):
+    """Get a filing by accession number, memoized to skip repeat EDGAR round-trips"""
+    filing = get_by_accession_number(accession_no)
+    if filing is None:
+        # Raising keeps the miss out of the cache - a filing EDGAR hasn't indexed yet may appear later
+        raise LookupError(f"Filing {accession_no} not found")
+    return filing
+
 @app.get("/api/filing/{accession_no}")
 async def get_filing_details(accession_no: str):
     """Get detailed information about a specific filing"""
     try:
-        filing = get_by_accession_number(accession_no)
+        filing = _fetch_filing(accession_no)
         
         filing_data = {
             "accession_no": filing.accession_no,
@@ -380,70 +593,91 @@ async def get_recent_filings(
         logger.error(f"Error getting recent filings: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Common SEC form types - static, so the body and its ETag are built once at import
+FORM_TYPES = [
+    {"value": "10-K", "text": "10-K - Annual Report"},
+    {"value": "10-Q", "text": "10-Q - Quarterly Report"},
+    {"value": "8-K", "text": "8-K - Current Report"},
+    {"value": "DEF 14A", "text": "DEF 14A - Proxy Statement"},
+    {"value": "13F-HR", "text": "13F-HR - Institutional Holdings"},
+    {"value": "4", "text": "Form 4 - Insider Transactions"},
+    {"value": "3", "text": "Form 3 - Initial Insider Ownership"},
+    {"value": "5", "text": "Form 5 - Annual Insider Summary"},
+    {"value": "S-1", "text": "S-1 - Registration Statement"},
+    {"value": "424B4", "text": "424B4 - Prospectus"},
+    {"value": "NPORT-P", "text": "NPORT-P - Fund Portfolio Holdings"}
+]
+FORM_TYPES_JSON = orjson.dumps(FORM_TYPES)
+FORM_TYPES_ETAG = _etag(FORM_TYPES_JSON)
+
 @app.get("/api/form-types")
-async def get_form_types():
+async def get_form_types(request: Request):
     """Get list of common SEC form types"""
-    return [
-        {"value": "10-K", "text": "10-K - Annual Report"},
-        {"value": "10-Q", "text": "10-Q - Quarterly Report"},
-        {"value": "8-K", "text": "8-K - Current Report"},
-        {"value": "DEF 14A", "text": "DEF 14A - Proxy Statement"},
-        {"value": "13F-HR", "text": "13F-HR - Institutional Holdings"},
-        {"value": "4", "text": "Form 4 - Insider Transactions"},
-        {"value": "3", "text": "Form 3 - Initial Insider Ownership"},
-        {"value": "5", "text": "Form 5 - Annual Insider Summary"},
-        {"value": "S-1", "text": "S-1 - Registration Statement"},
-        {"value": "424B4", "text": "424B4 - Prospectus"},
-        {"value": "NPORT-P", "text": "NPORT-P - Fund Portfolio Holdings"}
-    ]
+    headers = {"ETag": FORM_TYPES_ETAG, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, FORM_TYPES_ETAG):
+        return Response(status_code=304, headers=headers)
+    return Response(content=FORM_TYPES_JSON, media_type="application/json", headers=headers)
+
+# Attachments are sent in fixed-size chunks so large exhibits start flowing immediately
+ATTACHMENT_CHUNK_SIZE = 64 * 1024
+
+async def _iter_chunks(content: Union[str, bytes], chunk_size: int = ATTACHMENT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield attachment content as byte chunks for a StreamingResponse"""
+    # Async so Starlette sends the in-memory slices directly instead of via the threadpool
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    view = memoryview(content)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+
+# Attachment content types keyed by lowercase file extension
+_EXT_TO_MIME = {
+    '.html': 'text/html',
+    '.htm': 'text/html',
+    '.xml': 'application/xml',
+    '.txt': 'text/plain',
+    '.pdf': 'application/pdf',
+    '.xls': 'application/vnd.ms-excel',
+    '.xlsx': 'application/vnd.ms-excel',
+    '.doc': 'application/msword',
+    '.docx': 'application/msword',
+    '.csv': 'text/csv',
+    '.json': 'application/json',
+}
+
+def _file_extension(filename: str) -> str:
+    """Get the lowercase extension of a filename, including the dot"""
+    return os.path.splitext(filename)[1].lower()
+
+@ttl_cache(maxsize=256, ttl=FILING_CACHE_TTL)
+def _attachment_index(accession_no: str) -> Dict[str, Any]:
+    """Index a filing's attachments by filename, expiring along with _fetch_filing"""
+    filing = _fetch_filing(accession_no)
+    return {att.document: att for att in filing.attachments}
 
 @app.get("/api/filing/{accession_no}/attachment/{filename}")
 async def download_attachment(accession_no: str, filename: str):
     """Download a specific attachment from a filing"""
     try:
-        filing = get_by_accession_number(accession_no)
-        
-        # Find the attachment
-        attachment = None
-        for att in filing.attachments:
-            if att.document == filename:
-                attachment = att
-                break
+        attachments = _attachment_index(accession_no)
+        attachment = attachments.get(filename)
         
         if not attachment:
             raise HTTPException(status_code=404, detail=f"Attachment {filename} not found")
         
-        # Get the content
+        # Get the content - checked before streaming, since an error after the
+        # headers are sent would reach the client as a truncated 200
         content = attachment.download()
+        if content is None:
+            raise HTTPException(status_code=404, detail=f"Attachment {filename} has no content")
         
         # Determine content type based on file extension
-        content_type = "application/octet-stream"
-        filename_lower = filename.lower()
-        if filename_lower.endswith(('.html', '.htm')):
-            content_type = "text/html"
-        elif filename_lower.endswith('.xml'):
-            content_type = "application/xml"
-        elif filename_lower.endswith('.txt'):
-            content_type = "text/plain"
-        elif filename_lower.endswith('.pdf'):
-            content_type = "application/pdf"
-        elif filename_lower.endswith(('.xls', '.xlsx')):
-            content_type = "application/vnd.ms-excel"
-        elif filename_lower.endswith(('.doc', '.docx')):
-            content_type = "application/msword"
-        elif filename_lower.endswith('.csv'):
-            content_type = "text/csv"
-        elif filename_lower.endswith('.json'):
-            content_type = "application/json"
+        content_type = _EXT_TO_MIME.get(_file_extension(filename), "application/octet-stream")
         
-        from fastapi.responses import Response
-        return Response(
-            content=content,
+        return StreamingResponse(
+            _iter_chunks(content),
             media_type=content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(content))
-            }
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
         
     except Exception as e:
@@ -454,59 +688,27 @@ async def download_attachment(accession_no: str, filename: str):
 async def view_attachment(accession_no: str, filename: str):
     """View a specific attachment from a filing (inline display)"""
     try:
-        filing = get_by_accession_number(accession_no)
-        
-        # Find the attachment
-        attachment = None
-        for att in filing.attachments:
-            if att.document == filename:
-                attachment = att
-                break
+        attachments = _attachment_index(accession_no)
+        attachment = attachments.get(filename)
         
         if not attachment:
             raise HTTPException(status_code=404, detail=f"Attachment {filename} not found")
         
-        # Get the content
+        # Get the content - checked before streaming, since an error after the
+        # headers are sent would reach the client as a truncated 200
         content = attachment.download()
+        if content is None:
+            raise HTTPException(status_code=404, detail=f"Attachment {filename} has no content")
         
-        # For text-based files, return as text for inline viewing
-        filename_lower = filename.lower()
-        if filename_lower.endswith(('.html', '.htm', '.xml', '.txt', '.csv', '.json')):
-            if isinstance(content, bytes):
-                content = content.decode('utf-8', errors='ignore')
-            
-            # Determine content type
-            if filename_lower.endswith(('.html', '.htm')):
-                content_type = "text/html"
-            elif filename_lower.endswith('.xml'):
-                content_type = "application/xml"
-            elif filename_lower.endswith('.csv'):
-                content_type = "text/csv"
-            elif filename_lower.endswith('.json'):
-                content_type = "application/json"
-            else:
-                content_type = "text/plain"
-            
-            from fastapi.responses import Response
-            return Response(
-                content=content,
-                media_type=content_type,
-                headers={"Content-Disposition": "inline"}
-            )
-        else:
-            # For binary files, still allow download
-            content_type = "application/octet-stream"
-            if filename.lower().endswith('.pdf'):
-                content_type = "application/pdf"
-            elif filename.lower().endswith('.xls') or filename.lower().endswith('.xlsx'):
-                content_type = "application/vnd.ms-excel"
-            
-            from fastapi.responses import Response
-            return Response(
-                content=content,
-                media_type=content_type,
-                headers={"Content-Disposition": "inline"}
-            )
+        content_type = _EXT_TO_MIME.get(_file_extension(filename), "application/octet-stream")
+        
+        # Content is passed through as-is (no decode pass); the media type tells the
+        # browser how to render text files, and binary files are still sent inline
+        return StreamingResponse(
+            _iter_chunks(content),
+            media_type=content_type,
+            headers={"Content-Disposition": "inline"}
+        )
         
     except Exception as e:
         logger.error(f"Error viewing attachment: {e}")
@@ -516,7 +718,7 @@ async def view_attachment(accession_no: str, filename: str):
 async def get_filing_attachments(accession_no: str):
     """Get list of attachments for a filing with metadata"""
     try:
-        filing = get_by_accession_number(accession_no)
+        filing = _fetch_filing(accession_no)
         
         attachments = []
         for attachment in filing.attachments:
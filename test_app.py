@@ -1,12 +1,27 @@
 """
 Simple test to verify the application setup
 """
+import asyncio
+import orjson
+import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
-from main import app
+import main
+from main import app, cache_company, cache_filings_bulk
 
 client = TestClient(app)
 
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan(tmp_path_factory):
+    """Run the app lifespan against a throwaway database so tests don't touch the real cache"""
+    db_path = main.DB_PATH
+    main.DB_PATH = str(tmp_path_factory.mktemp("db") / "edgar_cache.db")
+    try:
+        with client:
+            yield
+    finally:
+        main.DB_PATH = db_path
+
 def test_read_main():
     """Test that the main page loads"""
     response = client.get("/")
@@ -22,6 +37,13 @@ def test_form_types():
     assert len(data) > 0
     assert any(form["value"] == "10-K" for form in data)
 
+def test_form_types_not_modified():
+    """Test that a matching If-None-Match gets a bodiless 304"""
+    etag = client.get("/api/form-types").headers["etag"]
+    response = client.get("/api/form-types", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
 def test_search_companies():
     """Test company search endpoint"""
     response = client.get("/api/search/companies?q=AAPL")
@@ -29,5 +51,147 @@ def test_search_companies():
     # Note: This might fail if EDGAR is not accessible or identity not set
     # In a real test environment, you'd mock the EDGAR API calls
 
+def test_search_free_text_skips_direct_lookup(monkeypatch):
+    """Test that non-ticker queries go straight to the name search"""
+    class FakeResults:
+        companies = []
+
+    def fail_direct_lookup(ticker):
+        raise AssertionError("free-text query should not be looked up as a ticker")
+
+    monkeypatch.setattr(main, "Company", fail_direct_lookup)
+    monkeypatch.setattr(main, "find_company", lambda q: FakeResults())
+    response = client.get("/api/search/companies?q=apple inc")
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_cached_company_info():
+    """Test that cached company data is served without hitting EDGAR"""
+    company_data = {"ticker": "ZZTEST", "cik": "0000000001", "name": "Cached Test Co"}
+    client.portal.call(cache_company, "ZZTEST", company_data)
+    response = client.get("/api/company/zztest")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == company_data
+
+    response = client.get("/api/company/ZZTEST", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+def test_company_refill_does_not_resurrect_stale_row():
+    """Test that a write during a cache-miss read keeps the old row out of memory"""
+    async def read_during_write():
+        await cache_company("ZZRACE", {"ticker": "ZZRACE", "name": "old"})
+        main._company_cache.pop("ZZRACE", None)
+        reader = asyncio.create_task(main.get_cached_company_json("ZZRACE"))
+        await asyncio.sleep(0)
+        await cache_company("ZZRACE", {"ticker": "ZZRACE", "name": "new"})
+        await reader
+        return await main.get_cached_company_json("ZZRACE")
+
+    assert orjson.loads(client.portal.call(read_during_write))["name"] == "new"
+
+def test_cached_company_filings():
+    """Test that cached filings are returned newest first and honor the limit"""
+    filings = [
+        {"accession_no": f"ZZTEST-{day}", "ticker": "ZZTEST", "form": "10-K",
+         "filing_date": f"2020-01-{day:02d}", "company_name": "Cached Test Co"}
+        for day in range(1, 4)
+    ]
+    client.portal.call(cache_filings_bulk, filings)
+    response = client.get("/api/company/ZZTEST/filings?form=10-K&limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [f["accession_no"] for f in data] == ["ZZTEST-3", "ZZTEST-2"]
+
+def test_company_financials_envelope(monkeypatch):
+    """Test that empty statements are omitted, failed ones are [] and floats and dates round-trip exactly"""
+    class FakeFinancials:
+        def balance_sheet(self):
+            return pd.DataFrame([
+                {"Concept": "Assets", "2024": 6.123456789012345, "Period": pd.Timestamp("2024-01-01")},
+                {"Concept": "Ratio", "2024": -0.00012345678901234567, "Period": pd.Timestamp("2024-01-01")},
+                {"Concept": "Sum", "2024": 0.30000000000000004, "Period": pd.Timestamp("2024-01-01")},
+                {"Concept": "Large", "2024": 1.2345678901234566e17, "Period": pd.Timestamp("2024-01-01")}
+            ])
+
+        def income_statement(self):
+            raise ValueError("statement unavailable")
+
+        def cashflow_statement(self):
+            return pd.DataFrame()
+
+    class FakeCompany:
+        def __init__(self, ticker):
+            pass
+
+        def get_financials(self):
+            return FakeFinancials()
+
+    monkeypatch.setattr(main, "Company", FakeCompany)
+    response = client.get("/api/company/ZZTEST/financials")
+    assert response.status_code == 200
+    assert response.json() == {
+        "balance_sheet": [
+            {"Concept": "Assets", "2024": 6.123456789012345, "Period": "2024-01-01T00:00:00"},
+            {"Concept": "Ratio", "2024": -0.00012345678901234567, "Period": "2024-01-01T00:00:00"},
+            {"Concept": "Sum", "2024": 0.30000000000000004, "Period": "2024-01-01T00:00:00"},
+            {"Concept": "Large", "2024": 1.2345678901234566e17, "Period": "2024-01-01T00:00:00"}
+        ],
+        "income_statement": []
+    }
+
+class FakeAttachment:
+    def __init__(self, document, content):
+        self.document = document
+        self.content = content
+
+    def download(self):
+        return self.content
+
+class FakeFiling:
+    def __init__(self, attachments):
+        self.attachments = attachments
+
+def test_download_attachment_streams_content(monkeypatch):
+    """Test that attachment downloads are streamed back intact"""
+    content = b"x" * (200 * 1024 + 7)
+    filing = FakeFiling([FakeAttachment("ex99.pdf", content)])
+    monkeypatch.setattr(main, "get_by_accession_number", lambda accession_no: filing)
+    response = client.get("/api/filing/0000000000-00-000001/attachment/ex99.pdf")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-disposition"] == "attachment; filename=ex99.pdf"
+    assert response.content == content
+
+def test_filing_lookup_miss_is_not_cached(monkeypatch):
+    """Test that a filing EDGAR couldn't find yet is looked up again on the next request"""
+    accession_no = "0000000000-00-000003"
+    monkeypatch.setattr(main, "get_by_accession_number", lambda accession_no: None)
+    response = client.get(f"/api/filing/{accession_no}/attachments")
+    assert response.status_code == 500
+
+    filing = FakeFiling([FakeAttachment("ex99.htm", b"")])
+    monkeypatch.setattr(main, "get_by_accession_number", lambda accession_no: filing)
+    response = client.get(f"/api/filing/{accession_no}/attachments")
+    assert response.status_code == 200
+    assert [att["filename"] for att in response.json()] == ["ex99.htm"]
+
+def test_download_attachment_without_content(monkeypatch):
+    """Test that an attachment with no content is an error, not an empty 200"""
+    filing = FakeFiling([FakeAttachment("ex99.pdf", None)])
+    monkeypatch.setattr(main, "get_by_accession_number", lambda accession_no: filing)
+    response = client.get("/api/filing/0000000000-00-000004/attachment/ex99.pdf")
+    assert response.status_code >= 400
+
+def test_view_attachment_content_type(monkeypatch):
+    """Test that inline views pick the content type from the file extension"""
+    filing = FakeFiling([FakeAttachment("Report.HTM", b"<html>report</html>")])
+    monkeypatch.setattr(main, "get_by_accession_number", lambda accession_no: filing)
+    response = client.get("/api/filing/0000000000-00-000002/attachment/Report.HTM/view")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["content-disposition"] == "inline"
+    assert response.text == "<html>report</html>"
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file